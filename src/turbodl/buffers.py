@@ -1,100 +1,151 @@
 # Standard modules
-from io import BytesIO
+from collections import deque
+from threading import Lock
 from time import time
 
 # Third-party modules
 from psutil import virtual_memory
 
 # Local modules
-from .constants import CHUNK_SIZE, MAX_BUFFER_SIZE, MAX_RAM_USAGE
+from .constants import CHUNK_SIZE, MAX_BUFFER_SIZE, MAX_RAM_USAGE, MIN_CHUNK_SIZE
+
+
+class BufferPool:
+    """A thread-safe pool of reusable byte slabs shared by download workers."""
+
+    def __init__(self, slab_size_bytes: int = MIN_CHUNK_SIZE) -> None:
+        """
+        Initialize a BufferPool with the given slab size.
+
+        Args:
+            slab_size_bytes: The initial size of each slab in bytes.
+        """
+
+        self.slab_size = slab_size_bytes
+
+        # Snapshot the RAM budget once per pool (one per download) so each worker's buffer
+        # does not re-read /proc/meminfo on construction
+        self.max_buffer_size = min(MAX_BUFFER_SIZE, int(virtual_memory().available * MAX_RAM_USAGE))
+
+        # Released slabs, ready to be handed out again
+        self._slabs: deque[bytearray] = deque()
+        self._lock = Lock()
+
+    def acquire(self) -> bytearray:
+        """
+        Get a slab from the pool, allocating a new one if the pool is empty.
+
+        Returns:
+            A reusable bytearray slab.
+        """
+
+        with self._lock:
+            if self._slabs:
+                return self._slabs.popleft()
+
+        # Allocate a new slab outside the lock
+        return bytearray(self.slab_size)
+
+    def release(self, slab: bytearray) -> None:
+        """
+        Return a slab to the pool for reuse.
+
+        Args:
+            slab: The slab to return to the pool.
+        """
+
+        with self._lock:
+            self._slabs.append(slab)
 
 
 class ChunkBuffer:
-    """A ChunkBuffer is a memory buffer that stores a chunk of a file being downloaded."""
+    """
+    A ChunkBuffer is a memory buffer that stores a chunk of a file being downloaded.
+
+    Each buffer is owned by exactly one worker thread, which both fills it and flushes it, so the hot write path needs no lock; only the slab pool underneath is shared and briefly locked on acquire/release.
+    """
 
-    def __init__(self, chunk_size_bytes: int = CHUNK_SIZE, max_buffer_size_bytes: int = MAX_BUFFER_SIZE) -> None:
+    def __init__(
+        self, chunk_size_bytes: int = CHUNK_SIZE, max_buffer_size_bytes: int = MAX_BUFFER_SIZE, pool: BufferPool | None = None
+    ) -> None:
         """
         Initialize a ChunkBuffer with the given chunk size and max buffer size.
 
         Args:
             chunk_size_bytes: The maximum size of each chunk in bytes.
             max_buffer_size_bytes: The maximum size of the buffer in bytes.
+            pool: An optional BufferPool to acquire the backing slab from, enabling reuse across chunks.
         """
 
         self.chunk_size = chunk_size_bytes
 
-        # Make sure the max buffer size is not larger than the available memory
-        self.max_buffer_size = min(max_buffer_size_bytes, int(virtual_memory().available * MAX_RAM_USAGE))
+        # Make sure the max buffer size is not larger than the available memory, reusing the
+        # pool's snapshot when one exists instead of querying psutil per buffer
+        if pool is not None:
+            self.max_buffer_size = min(max_buffer_size_bytes, pool.max_buffer_size)
+        else:
+            self.max_buffer_size = min(max_buffer_size_bytes, int(virtual_memory().available * MAX_RAM_USAGE))
 
-        # Initialize the buffer
-        self.current_buffer = BytesIO()
+        # Initialize the backing slab, reusing a pooled one when available
+        self._pool = pool
+        self.current_buffer = pool.acquire() if pool is not None else bytearray()
         self.current_size = 0
-        self.total_buffered = 0
         self.last_activity_time = time()
 
-    def write(self, data: bytes, total_file_size_bytes: int) -> bytes | None:
+    def write(self, data: bytes | memoryview) -> memoryview | None:
         """
         Write data to the buffer, and return a chunk of data if the buffer is full.
 
         Args:
             data: The data to write to the buffer.
-            total_file_size_bytes: The total size of the file in bytes.
 
         Returns:
-            A chunk of data if the buffer is full, otherwise None.
+            A zero-copy view of the full chunk, or None if the buffer is not full yet. The view is only valid until the next write; the caller must consume and release it first.
         """
 
         self.last_activity_time = time()
 
         data_size = len(data)
 
-        # If the buffer is full, return None
-        if self.current_size + data_size > self.max_buffer_size:
-            return None
-
-        # If we've already written more data than the total file size, return None
-        if self.total_buffered + data_size > total_file_size_bytes:
-            return None
-
-        # Write the data to the buffer
-        self.current_buffer.write(data)
+        # Write the data into the slab, growing it as needed; the budget check runs after
+        # the write so an overflowing piece forces an early flush instead of being dropped
+        self.current_buffer[self.current_size : self.current_size + data_size] = data
         self.current_size += data_size
-        self.total_buffered += data_size
 
         # If the buffer is full, return the chunk of data
-        if (
-            self.current_size >= self.chunk_size
-            or self.total_buffered >= total_file_size_bytes
-            or self.current_size >= self.max_buffer_size
-        ):
-            chunk_data = self.current_buffer.getvalue()
-
-            # Clear the buffer
-            self.current_buffer.close()
-            self.current_buffer = BytesIO()
+        if self.current_size >= self.chunk_size or self.current_size >= self.max_buffer_size:
+            # Hand out a view into the slab instead of copying the chunk out
+            chunk_data = memoryview(self.current_buffer)[: self.current_size]
+
+            # Rewind the cursor, keeping the slab for the next chunk
             self.current_size = 0
 
             return chunk_data
 
         return None
 
+    def get_remaining(self) -> memoryview:
+        """
+        Return any data still buffered that has not been flushed as a full chunk.
+
+        Returns:
+            A zero-copy view of the buffered bytes, which may be empty. The view is only valid until the next write; the caller must consume and release it first.
+        """
+
+        return memoryview(self.current_buffer)[: self.current_size]
+
     def reset_buffer(self) -> None:
-        """Reset the buffer to free memory without losing tracking information."""
-
-        if self.current_size > 0:
-            # Preserve the data if there's any
-            data = self.current_buffer.getvalue()
-            self.current_buffer.close()
-            self.current_buffer = BytesIO()
-            self.current_buffer.write(data)
-        else:
-            # Just create a new empty buffer
-            self.current_buffer.close()
-            self.current_buffer = BytesIO()
+        """Shrink the backing slab to the buffered data to free memory without losing tracking information."""
+
+        del self.current_buffer[self.current_size :]
 
-    def __del__(self) -> None:
-        """Destructor for the ChunkBuffer. Closes the BytesIO object to free up memory."""
+    def close(self) -> None:
+        """Release the backing slab, returning it to the pool if one was provided."""
+
+        slab = self.current_buffer
+        self.current_buffer = bytearray()
+        self.current_size = 0
 
-        if hasattr(self, "current_buffer"):
-            # Close the BytesIO object to free up memory
-            self.current_buffer.close()
+        if self._pool is not None:
+            self._pool.release(slab)
+            self._pool = None
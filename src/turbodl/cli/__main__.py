@@ -79,7 +79,7 @@ def download(
     output_path: str = Argument(
         None, help="Destination path. If directory, filename is derived from server response.", show_default="Current directory"
     ),
-    max_connections: str = Option("auto", "--max-connections", "-mc", help="Max connections: 'auto' or integer (1-32)."),
+    max_connections: str = Option("auto", "--max-connections", "-mc", help="Max connections: 'auto' or integer (1-64)."),
     connection_speed_mbps: int = Option(
         80, "--connection-speed", "-cs", help="Connection speed in Mbps for optimal connections."
     ),
@@ -104,7 +104,7 @@ def download(
         "md5",
         "--hash-type",
         "-ht",
-        help="Hash algorithm for verification. Available: md5, sha1, sha224, sha256, sha384, sha512, blake2b, blake2s, sha3_224, sha3_256, sha3_384, sha3_512, shake_128, shake_256",
+        help="Hash algorithm for verification. Available: md5, sha1, sha224, sha256, sha384, sha512, blake2b, blake2s, sha3_224, sha3_256, sha3_384, sha3_512, shake_128, shake_256, blake3 (needs the blake3 package)",
     ),
 ) -> None:
     """Download a file from the provided URL to the specified output path (with a lot of options)"""
@@ -1,4 +1,6 @@
 # Standard modules
+from math import ceil
+from os import getenv
 from typing import Final, Literal
 
 
@@ -9,38 +11,65 @@ ONE_GB: Final[int] = 1024**3
 # Chunk size constants
 MIN_CHUNK_SIZE: Final[int] = 16 * 1024**2
 MAX_CHUNK_SIZE: Final[int] = 256 * 1024**2
+CHUNK_SIZE_FLOOR: Final[int] = 256 * 1024  # Hard lower bound for adaptive chunk sizing
+CHUNK_TARGET_SECONDS: Final[float] = 0.25  # Each chunk should hold roughly this much transfer time
 CHUNK_SIZE: Final[int] = 256 * 1024**2
 MAX_BUFFER_SIZE: Final[int] = 2 * 1024**3
+SMALL_FILE_PIPELINE_THRESHOLD: Final[int] = 32 * 1024**2  # Below this, multiplex ranges over one connection
+
+# I/O constants
+WRITE_COALESCE_BUFFERS: Final[int] = 16  # Max network chunks batched into one pwritev call
+STREAM_READ_SIZE: Final[int] = (
+    ONE_MB  # Bytes pulled per read from a response stream; large reads keep per-chunk Python overhead off the hot path
+)
 
 # Connection constants
-MAX_CONNECTIONS: Final[int] = 24
+MAX_CONNECTIONS: Final[int] = int(getenv("TURBODL_MAX_CONNECTIONS", "64"))
 MIN_CONNECTIONS: Final[int] = 2
+MAX_CONNECTIONS_PER_HOST: Final[int] = 19  # Stays under the rate limits commonly enforced by download mirrors
+DEFAULT_STREAM_WINDOW: Final[int] = 256 * 1024  # Approximate bytes in flight per TCP stream
+
+
+def compute_max_connections(bandwidth_mbps: float, rtt_ms: float) -> int:
+    """
+    Compute the number of parallel connections needed to saturate the link's bandwidth-delay product.
+
+    Args:
+        bandwidth_mbps: The available bandwidth in Mbps.
+        rtt_ms: The measured round-trip time in milliseconds.
+
+    Returns:
+        The number of connections clamped between MIN_CONNECTIONS and MAX_CONNECTIONS.
+    """
+
+    # Bandwidth-delay product: bytes in flight needed to keep the pipe full
+    bdp_bytes = bandwidth_mbps * 1_000_000 / 8 * (rtt_ms / 1000)
+
+    # One connection per stream window worth of in-flight data
+    return max(MIN_CONNECTIONS, min(MAX_CONNECTIONS, ceil(bdp_bytes / DEFAULT_STREAM_WINDOW)))
+
 
 # File system constants
 RAM_FILESYSTEMS: Final[frozenset[str]] = frozenset({"tmpfs", "ramfs", "devtmpfs"})
 
 # HTTP headers
-DEFAULT_HEADERS: Final[tuple[dict[str, str], ...]] = (
-    {
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
-    },
-    {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36"
-    },
-    {"DNT": "1"},
-    {"Connection": "keep-alive"},
-    {"Cache-Control": "max-age=0"},
-    {"Accept-Language": "en-US,en;q=0.9"},
-    {"Sec-Fetch-Dest": "document"},
-    {"Sec-Fetch-Mode": "navigate"},
-    {"Sec-Fetch-Site": "none"},
-    {"Sec-Fetch-User": "?1"},
-    {"Upgrade-Insecure-Requests": "1"},
-    {"sec-ch-ua": '"Not.A/Brand";v="8", "Chromium";v="114", "Google Chrome";v="114"'},
-    {"sec-ch-ua-mobile": "?0"},
-    {"sec-ch-ua-platform": '"Windows"'},
-)
-REQUIRED_HEADERS: Final[tuple[dict[str, str], ...]] = ({"Accept-Encoding": "identity"},)
+DEFAULT_HEADERS: Final[dict[str, str]] = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "DNT": "1",
+    "Cache-Control": "max-age=0",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Upgrade-Insecure-Requests": "1",
+    "sec-ch-ua": '"Not.A/Brand";v="8", "Chromium";v="114", "Google Chrome";v="114"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Windows"',
+}
+REQUIRED_HEADERS: Final[dict[str, str]] = {"Accept-Encoding": "identity"}
+BASE_HEADERS: Final[dict[str, str]] = {**DEFAULT_HEADERS, **REQUIRED_HEADERS}  # Merged once at import time
 
 # Units and values
 YES_NO_VALUES: Final[tuple[Literal["no"], Literal["yes"]]] = ("no", "yes")
@@ -1,70 +1,130 @@
 # Standard modules
-from os import PathLike
+from os import PathLike, scandir
 from pathlib import Path
 from signal import SIGINT, SIGTERM, Signals, signal
-from sys import exit
+from sys import exit, stdout
 from types import FrameType
 from typing import Literal, NoReturn
 
 # Third-party modules
 from httpx import Client
 from humanfriendly import InvalidSize, format_size, parse_size
+from psutil import virtual_memory
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
-from streamsnapper import YouTube, YouTubeExtractor
+from rich.text import Text
 
 # Local modules
 from .buffers import ChunkBuffer
-from .downloaders import download_with_buffer, download_without_buffer
+from .constants import (
+    MAX_CONNECTIONS,
+    MAX_CONNECTIONS_PER_HOST,
+    MAX_RAM_USAGE,
+    SMALL_FILE_PIPELINE_THRESHOLD,
+    compute_max_connections,
+)
+from .core_async import download_ranges
+from .downloaders import download_with_buffer
 from .exceptions import DownloadInterruptedError, InvalidArgumentError, NotEnoughSpaceError, UnidentifiedFileSizeError
 from .merger import Merger
+from .resume import ResumeTracker
 from .utils import (
+    CoalescedProgress,
     CustomDownloadColumn,
     CustomSpeedColumn,
     CustomTimeColumn,
+    StreamingHasher,
+    advise_file_sequential,
     bool_to_yes_no,
     calculate_max_connections,
+    drop_file_cache,
     fetch_file_info,
     generate_chunk_ranges,
     has_available_space,
     is_ram_directory,
+    pre_allocate_file,
     truncate_url,
     verify_hash,
 )
 
 
+# Progress columns are stateless renderers; building them once at import avoids re-parsing
+# every style string into a rich Style object on each download call
+_PRE_ALLOCATE_COLUMNS = (
+    SpinnerColumn(spinner_name="dots", style="bold cyan"),
+    TextColumn("[bold cyan]{task.description}", justify="left"),
+)
+_DOWNLOAD_COLUMNS = (
+    TextColumn("[bold bright_black]╰─◾"),
+    BarColumn(style="bold white", complete_style="bold red", finished_style="bold green"),
+    TextColumn("[bold bright_black]•"),
+    CustomDownloadColumn(style="bold"),
+    TextColumn("[bold bright_black]• [magenta][progress.percentage]{task.percentage:>3.0f}%"),
+    TextColumn("[bold bright_black]•"),
+    CustomSpeedColumn(style="bold"),
+    TextColumn("[bold bright_black]•"),
+    CustomTimeColumn(
+        elapsed_style="bold steel_blue",
+        remaining_style="bold blue",
+        separator="•",
+        separator_style="bold bright_black",
+    ),
+)
+
+
 class TurboDL:
+    # Process-wide state shared by every instance: signal handlers can only be installed once,
+    # and reusing one pooled client across instances skips repeated TLS-context construction
+    _handlers_installed: bool = False
+    _active_instance: "TurboDL | None" = None
+    _shared_client: Client | None = None
+
     def __init__(
-        self, max_connections: int | Literal["auto"] = "auto", connection_speed_mbps: float = 100, show_progress_bar: bool = True
+        self,
+        max_connections: int | Literal["auto"] = "auto",
+        connection_speed_mbps: float = 100,
+        show_progress_bar: bool = True,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
     ) -> None:
         """
         Initialize a TurboDL instance with specified settings.
 
         Args:
-            max_connections: Maximum connections for parallel downloading. Minimum is 1 and maximum is 32. Defaults to 'auto'.
+            max_connections: Maximum connections for parallel downloading. Minimum is 1 and maximum is MAX_CONNECTIONS. Defaults to 'auto'.
             connection_speed_mbps: Your current internet connection speed in Mbps. Defaults to 100.
-            show_progress_bar: Whether to display a progress bar. Defaults to True.
+            show_progress_bar: Whether to display a progress bar. Automatically disabled when stdout is not a terminal. Defaults to True.
+            max_connections_per_host: Cap on simultaneous in-flight range requests against a single host. Defaults to MAX_CONNECTIONS_PER_HOST.
         """
 
         # Setup signal handlers for clean exit
         self._setup_signal_handlers()
 
         # Validate max_connections argument
-        if isinstance(max_connections, int) and not 1 <= max_connections <= 32:
-            raise InvalidArgumentError("max_connections must be between 1 and 32")
+        if isinstance(max_connections, int) and not 1 <= max_connections <= MAX_CONNECTIONS:
+            raise InvalidArgumentError(f"max_connections must be between 1 and {MAX_CONNECTIONS}")
 
         # Validate connection_speed_mbps argument
         if connection_speed_mbps <= 0:
             raise InvalidArgumentError("connection_speed_mbps must be positive")
 
+        # Validate max_connections_per_host argument
+        if max_connections_per_host < 1:
+            raise InvalidArgumentError("max_connections_per_host must be at least 1")
+
+        # Without a terminal (pipes, CI) there is nothing to render, so skip the per-tick refresh work
+        if show_progress_bar and not stdout.isatty():
+            show_progress_bar = False
+
         # Initialize private attributes
         self._max_connections: int | Literal["auto"] = max_connections
+        self._max_connections_per_host: int = max_connections_per_host
         self._connection_speed_mbps: float = connection_speed_mbps
         self._show_progress_bar: bool = show_progress_bar
         self._output_path: Path | None = None
         self._console: Console = Console()
-        self._http_client: Client | None = None
-        self._chunk_buffers: dict[str, ChunkBuffer] = {}
+        self._http_client: Client | None = TurboDL._shared_client
+        self._chunk_buffers: list[ChunkBuffer | None] = []
+        self._resume_tracker: ResumeTracker | None = None
 
         # Initialize public attributes
         self.output_path: str | None = None
@@ -72,12 +132,23 @@ class TurboDL:
     def _setup_signal_handlers(self) -> None:
         """Setup signal handlers for clean exit on SIGINT (Ctrl+C) and SIGTERM. This is useful for cleaning up temporary files and closing the HTTP client."""
 
+        # Cleanup targets the most recently created instance, which matches the old behavior
+        # where each new instance clobbered the previously registered handler
+        TurboDL._active_instance = self
+
+        # The handlers are process-wide, so installing them once is enough
+        if TurboDL._handlers_installed:
+            return
+
         # Setup signal handlers for clean exit
         for sig in (SIGINT, SIGTERM):
             # Set the signal handler
-            signal(sig, self._signal_handler)
+            signal(sig, TurboDL._signal_handler)
+
+        TurboDL._handlers_installed = True
 
-    def _signal_handler(self, signum: Signals, frame: FrameType | None) -> NoReturn:
+    @staticmethod
+    def _signal_handler(signum: Signals, frame: FrameType | None) -> NoReturn:
         """
         Handle received signals for a clean exit.
 
@@ -88,26 +159,47 @@ class TurboDL:
             frame: The current stack frame.
         """
 
-        # Perform cleanup operations
-        self._cleanup()
+        # Perform cleanup operations on the active instance, keeping the partial file and
+        # its sidecar whenever completed ranges exist for a later run to resume
+        if (instance := TurboDL._active_instance) is not None:
+            tracker = instance._resume_tracker
+            instance._cleanup(keep_partial=tracker is not None and tracker.has_progress)
 
         # Exit the application with a status code of 0
         exit(0)
 
-    def _cleanup(self) -> None:
+    def _cleanup(self, keep_partial: bool = False) -> None:
         """
         Perform cleanup operations before exiting the application.
 
         This method is called when the process receives a termination signal (e.g., SIGINT or SIGTERM) or when the application completes execution. It ensures that necessary cleanup is performed, such as deleting temporary files and closing the HTTP client.
+
+        Args:
+            keep_partial: Whether to keep the partially downloaded file so a later run can resume it. Defaults to False.
         """
 
-        # Remove temporary files if they exist
-        if isinstance(self._output_path, Path):
+        tracker = getattr(self, "_resume_tracker", None)
+
+        if keep_partial:
+            # Persist the progress made so far next to the partial file
+            if tracker is not None and tracker.has_progress:
+                tracker.save()
+        elif isinstance(self._output_path, Path):
+            # Remove temporary files if they exist, and any sidecar with them: without its
+            # partial file a leftover sidecar could never be resumed
             self._output_path.unlink(missing_ok=True)
 
-        # Close the HTTP client to free up system resources
-        if hasattr(self, "_http_client"):
+            if tracker is not None:
+                tracker.discard()
+
+        # Close the HTTP client to free up system resources, clearing the shared slot so
+        # later instances do not pick up a closed client
+        if getattr(self, "_http_client", None) is not None:
+            if TurboDL._shared_client is self._http_client:
+                TurboDL._shared_client = None
+
             self._http_client.close()
+            self._http_client = None
 
     def _download_single_file(
         self,
@@ -123,8 +215,10 @@ class TurboDL:
     ):
         """Perform the actual download operation."""
 
-        # Fetch file information from the server
-        generated_data = fetch_file_info(url, headers, inactivity_timeout, timeout)
+        # Fetch file information from the server, reusing the pooled client from previous downloads
+        generated_data = fetch_file_info(
+            url, headers, inactivity_timeout, timeout, self._http_client, self._connection_speed_mbps
+        )
 
         # Extract file information
         file_info = generated_data[0]
@@ -132,8 +226,9 @@ class TurboDL:
         filename: str = file_info.filename
         size: int | Literal["unknown"] = file_info.size
 
-        # Initialize HTTP client
+        # Initialize HTTP client and publish it for other instances to reuse
         self._http_client = generated_data[1]
+        TurboDL._shared_client = self._http_client
 
         if size == "unknown":
             try:
@@ -147,11 +242,26 @@ class TurboDL:
                     "Failed to parse the file size. Please provide a valid file size (e.g., 25MB, 800MiB, 1.5GB ...)."
                 ) from e
 
-        # Calculate optimal connections and chunk ranges
-        if self._max_connections == "auto":
-            self._max_connections = calculate_max_connections(size, self._connection_speed_mbps)
+        # Degrade to disk mode when the file would not fit in the RAM budget
+        if enable_ram_buffer and size > int(virtual_memory().available * MAX_RAM_USAGE):
+            enable_ram_buffer = False
+
+        # Calculate optimal connections and chunk ranges; keep the "auto" setting intact so
+        # later downloads on the same instance re-tune for their own file size
+        max_connections = self._max_connections
+
+        if max_connections == "auto":
+            max_connections = calculate_max_connections(size, self._connection_speed_mbps)
 
-        chunk_ranges = generate_chunk_ranges(size, self._max_connections)
+            # Raise toward the measured bandwidth-delay product when the initial request timing
+            # is available: high-latency links need more streams in flight to fill the pipe.
+            # Never lower the size-based count with it — the probe timing includes server
+            # processing and the per-stream window estimate is conservative, so on low-RTT
+            # links the BDP figure would clamp "auto" down to the floor
+            if file_info.rtt_ms is not None:
+                max_connections = max(max_connections, compute_max_connections(self._connection_speed_mbps, file_info.rtt_ms))
+
+        chunk_ranges = generate_chunk_ranges(size, max_connections, self._connection_speed_mbps)
 
         # Check for available disk space
         if not has_available_space(self._output_path, size):
@@ -162,82 +272,172 @@ class TurboDL:
             self._output_path = Path(self._output_path, filename)
 
         # Handle existing files based on the overwrite flag
-        if not overwrite:
+        if not overwrite and self._output_path.exists():
             base_name = self._output_path.stem
             extension = self._output_path.suffix
+
+            # List the parent once instead of stat-ing each candidate name in turn
+            existing_names = {entry.name for entry in scandir(self._output_path.parent)}
             counter = 1
 
-            while self._output_path.exists():
-                self._output_path = Path(self._output_path.parent, f"{base_name}_{counter}{extension}")
+            while f"{base_name}_{counter}{extension}" in existing_names:
                 counter += 1
 
+            self._output_path = Path(self._output_path.parent, f"{base_name}_{counter}{extension}")
+
+        # Resume bookkeeping: a sidecar left by a previous interrupted run lets completed
+        # ranges be skipped; the instance slot exposes it to the signal-driven cleanup
+        resume_tracker = self._resume_tracker = ResumeTracker(self._output_path, url, size)
+        pending_ranges = chunk_ranges
+
+        if self._output_path.exists() and resume_tracker.load():
+            pending_ranges = resume_tracker.filter_pending(chunk_ranges)
+
+        # Bytes already on disk from the previous run
+        skipped_bytes = sum(end - start + 1 for start, end in chunk_ranges) - sum(
+            end - start + 1 for start, end in pending_ranges
+        )
+
+        # A previous run already completed every range (it was interrupted between the last
+        # write and the sidecar removal): there is nothing to download, so skip straight to
+        # verification instead of handing the downloaders an empty range list
+        if not pending_ranges:
+            resume_tracker.discard()
+            self._resume_tracker = None
+
+            if expected_hash is not None:
+                verify_hash(self._output_path, expected_hash, hash_type)
+
+            drop_file_cache(self._output_path, size)
+
+            return
+
         try:
             # Pre-allocate space if required
             if pre_allocate_space:
                 with Progress(
-                    SpinnerColumn(spinner_name="dots", style="bold cyan"),
-                    TextColumn(f"[bold cyan]Pre-allocating space for {size} bytes...", justify="left"),
+                    *_PRE_ALLOCATE_COLUMNS,
                     transient=True,
                     disable=not self._show_progress_bar,
                 ) as progress:
-                    progress.add_task("", total=None)
+                    progress.add_task(f"Pre-allocating space for {size} bytes...", total=None)
 
-                with self._output_path.open("wb") as fo:
-                    fo.truncate(size)
+                pre_allocate_file(self._output_path, size)
             else:
                 self._output_path.touch(exist_ok=True)
 
-            # Display progress bar header
+            # Hint the writeback machinery that the file fills sequentially
+            advise_file_sequential(self._output_path, size)
+
+            # Display progress bar header; assembling styled segments directly skips re-lexing
+            # the markup tags on every download (the style strings themselves are cached by rich)
             if self._show_progress_bar:
                 self._console.print(
-                    f"[bold bright_black]╭ [green]Downloading [blue]{truncate_url(url)} [bright_black]• [green]{'~' + format_size(size) if size is not None else 'Unknown'}"
+                    Text.assemble(
+                        ("╭ ", "bold bright_black"),
+                        ("Downloading ", "bold green"),
+                        (truncate_url(url), "bold blue underline"),
+                        (" ", "bold blue"),
+                        ("• ", "bold bright_black"),
+                        ("~" + format_size(size) if size is not None else "Unknown", "bold green"),
+                    )
                 )
                 self._console.print(
-                    f"[bold bright_black]│ [green]Output file: [cyan]{self._output_path.as_posix()} [bright_black]• [green]RAM buffer: [cyan]{bool_to_yes_no(enable_ram_buffer)} [bright_black]• [green]Connections: [cyan]{self._max_connections}"
+                    Text.assemble(
+                        ("│ ", "bold bright_black"),
+                        ("Output file: ", "bold green"),
+                        (f"{self._output_path.as_posix()} ", "bold cyan"),
+                        ("• ", "bold bright_black"),
+                        ("RAM buffer: ", "bold green"),
+                        (f"{bool_to_yes_no(enable_ram_buffer)} ", "bold cyan"),
+                        ("• ", "bold bright_black"),
+                        ("Connections: ", "bold green"),
+                        (str(max_connections), "bold cyan"),
+                    )
                 )
 
             # Setup progress bar and execute download
             with Progress(
-                *[
-                    TextColumn("[bold bright_black]╰─◾"),
-                    BarColumn(style="bold white", complete_style="bold red", finished_style="bold green"),
-                    TextColumn("[bold bright_black]•"),
-                    CustomDownloadColumn(style="bold"),
-                    TextColumn("[bold bright_black]• [magenta][progress.percentage]{task.percentage:>3.0f}%"),
-                    TextColumn("[bold bright_black]•"),
-                    CustomSpeedColumn(style="bold"),
-                    TextColumn("[bold bright_black]•"),
-                    CustomTimeColumn(
-                        elapsed_style="bold steel_blue",
-                        remaining_style="bold blue",
-                        separator="•",
-                        separator_style="bold bright_black",
-                    ),
-                ],
+                *_DOWNLOAD_COLUMNS,
                 disable=not self._show_progress_bar,
             ) as progress:
                 task_id = progress.add_task("download", total=size, filename=self._output_path.name)
 
-                if enable_ram_buffer:
-                    download_with_buffer(
-                        self._http_client, url, self._output_path, size, self._chunk_buffers, chunk_ranges, task_id, progress
-                    )
-                else:
-                    download_without_buffer(self._http_client, url, self._output_path, chunk_ranges, task_id, progress)
-        except KeyboardInterrupt as e:
-            # Clean up after interruption
-            self._cleanup()
-
-            raise DownloadInterruptedError("Download interrupted by user") from e
-        except Exception as e:
-            # Clean up after failure
-            self._cleanup()
-
-            raise e
+                # Account for the ranges a previous run already wrote
+                if skipped_bytes:
+                    progress.update(task_id, advance=skipped_bytes)
+
+                # Hash the data as it arrives so the file does not have to be re-read afterwards; a resumed
+                # download never sees the already-written bytes, so it falls back to the on-disk verification
+                streaming_hasher = StreamingHasher(hash_type) if expected_hash is not None and not skipped_bytes else None
+
+                # Batch the per-chunk updates so the workers never contend on rich's render lock
+                coalesced_progress = CoalescedProgress(progress, task_id)
+
+                try:
+                    # Small files skip the RAM staging layer: their ranges are multiplexed over a
+                    # single keep-alive connection by the async path, where buffering buys nothing.
+                    # The RAM-buffered path stays on threads: its flushes write through a shared
+                    # mmap, and those page faults would block an event loop for every slab, whereas
+                    # the unbuffered ranges only issue non-blocking socket reads between writevs
+                    if enable_ram_buffer and size > SMALL_FILE_PIPELINE_THRESHOLD:
+                        download_with_buffer(
+                            self._http_client,
+                            url,
+                            self._output_path,
+                            size,
+                            self._chunk_buffers,
+                            pending_ranges,
+                            task_id,
+                            coalesced_progress,
+                            streaming_hasher,
+                            resume_tracker,
+                        )
+                    else:
+                        download_ranges(
+                            self._http_client,
+                            url,
+                            self._output_path,
+                            pending_ranges,
+                            task_id,
+                            coalesced_progress,
+                            self._max_connections_per_host,
+                            streaming_hasher,
+                            resume_tracker,
+                        )
+                finally:
+                    # Stop the flusher and push the final delta so the bar lands on 100%
+                    coalesced_progress.close()
+
+                    # Join the hashing thread whether or not verify() runs afterwards: an
+                    # overflowed or abandoned hasher would otherwise leak the thread along
+                    # with whatever out-of-order data it had parked
+                    if streaming_hasher is not None:
+                        streaming_hasher.close()
+
+            # The file is complete: the resume sidecar is no longer needed
+            resume_tracker.discard()
+            self._resume_tracker = None
+        except (KeyboardInterrupt, Exception) as e:
+            # Keep the partial file for a later resume (cleanup persists the progress made so
+            # far); the file is only deleted when no completed range would survive to be reused
+            self._cleanup(keep_partial=resume_tracker.has_progress)
+
+            if isinstance(e, KeyboardInterrupt):
+                raise DownloadInterruptedError("Download interrupted by user") from e
+
+            raise
 
         # Verify the hash of the downloaded file, if provided
         if expected_hash is not None:
-            verify_hash(self._output_path, expected_hash, hash_type)
+            if streaming_hasher is not None and not streaming_hasher.overflowed:
+                # The hash was computed while the data was in flight, no re-read needed
+                streaming_hasher.verify(expected_hash)
+            else:
+                verify_hash(self._output_path, expected_hash, hash_type)
+
+        # The file will not be re-read from here on: let the kernel reclaim its cached pages
+        drop_file_cache(self._output_path, size)
 
     def download(
         self,
@@ -265,6 +465,7 @@ class TurboDL:
             "sha3_512",
             "shake_128",
             "shake_256",
+            "blake3",
         ] = "md5",
     ) -> None:
         """
@@ -280,7 +481,7 @@ class TurboDL:
             inactivity_timeout: Timeout in seconds after the connection is considered idle. None means no timeout. Defaults to 120.
             timeout: Overall timeout in seconds. None means no timeout. Defaults to None.
             expected_hash: The expected hash value of the downloaded file. If provided, the file will be verified after download. Defaults to None.
-            hash_type: Hash algorithm to use for verification. Available: md5, sha1, sha224, sha256, sha384, sha512, blake2b, blake2s, sha3_224, sha3_256, sha3_384, sha3_512, shake_128, shake_256. Defaults to "md5".
+            hash_type: Hash algorithm to use for verification. Available: md5, sha1, sha224, sha256, sha384, sha512, blake2b, blake2s, sha3_224, sha3_256, sha3_384, sha3_512, shake_128, shake_256, and blake3 when the optional blake3 package is installed. Defaults to "md5".
         Raises:
             NotEnoughSpaceError: If there's not enough space to download the file.
             DownloadInterruptedError: If the download is interrupted by the user.
@@ -292,8 +493,16 @@ class TurboDL:
         # Determine if output path is a RAM directory and set RAM buffer flag
         is_ram_dir = is_ram_directory(self._output_path)
 
-        if enable_ram_buffer == "auto":
-            enable_ram_buffer = not is_ram_dir
+        if is_ram_dir:
+            # The output already lives in RAM: staging bytes in an extra buffer first
+            # would hold two copies of the file in memory for no gain
+            enable_ram_buffer = False
+        elif enable_ram_buffer == "auto":
+            enable_ram_buffer = True
+
+        # Deferred import: streamsnapper pulls its whole YouTube stack at import time, which
+        # dominates `import turbodl` cold start even for callers that never pass a YouTube URL
+        from streamsnapper import YouTube, YouTubeExtractor
 
         # Check if the URL is a YouTube video
         youtube_extractor = YouTubeExtractor()
@@ -0,0 +1,263 @@
+# Standard modules
+from asyncio import Semaphore, gather, get_running_loop, run
+from collections.abc import Sequence
+from importlib.util import find_spec
+from os import O_CREAT, O_WRONLY, PathLike
+from os import close as os_close
+from os import open as os_open
+from pathlib import Path
+from typing import Final
+
+# Third-party modules
+from httpx import (
+    AsyncClient,
+    AsyncHTTPTransport,
+    Client,
+    ConnectError,
+    ConnectTimeout,
+    Limits,
+    ReadTimeout,
+    RemoteProtocolError,
+    TimeoutException,
+)
+from rich.progress import Progress, TaskID
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+# Local modules
+from .constants import (
+    MAX_CONNECTIONS,
+    MAX_CONNECTIONS_PER_HOST,
+    SMALL_FILE_PIPELINE_THRESHOLD,
+    STREAM_READ_SIZE,
+    WRITE_COALESCE_BUFFERS,
+)
+from .downloaders import _positioned_writev, download_without_buffer
+from .resume import ResumeTracker
+from .utils import SHARED_SSL_CONTEXT, UNVERIFIED_SSL_CONTEXT, CoalescedProgress, StreamingHasher
+
+
+# HTTP/2 support requires the optional h2 package
+HTTP2_AVAILABLE: Final[bool] = find_spec("h2") is not None
+
+try:
+    # Optional: libuv-backed event loop with faster socket readiness handling
+    from uvloop import new_event_loop as uv_new_event_loop
+except ImportError:
+    uv_new_event_loop = None
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(min=2, max=120),
+    retry=retry_if_exception_type((ConnectError, ConnectTimeout, ReadTimeout, RemoteProtocolError, TimeoutException)),
+    reraise=True,
+)
+async def _download_range(
+    client: AsyncClient,
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    task_id: int,
+    progress: Progress | CoalescedProgress,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
+) -> None:
+    """
+    Download a single byte range and write it to the output file at its offset.
+
+    Args:
+        client: The asynchronous HTTP client to use for the request.
+        url: The URL of the file to download.
+        fd: The file descriptor of the output file, shared by all ranges.
+        start: The start byte position of the range.
+        end: The end byte position of the range.
+        task_id: The task ID for progress tracking.
+        progress: The progress tracker.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records the range once it is fully written.
+    """
+
+    # Track progress within the range so a mid-stream failure re-requests only the missing
+    # tail instead of refetching bytes that already landed on disk
+    range_start = start
+    received = 0
+    received_at_last_failure = -1
+
+    # Built once instead of per read; the loop body only does integer math on it
+    task = TaskID(task_id)
+
+    while True:
+        headers = {"Range": f"bytes={range_start + received}-{end}"} if end > 0 else None
+
+        # Chunks awaiting their batched write, contiguous from pending_start
+        pending: list[bytes] = []
+        pending_start = range_start + received
+
+        try:
+            async with client.stream("GET", url, headers=headers) as r:
+                r.raise_for_status()
+
+                # Iterate over the raw response data in STREAM_READ_SIZE chunks, skipping the content-decoding layer
+                # (Accept-Encoding is forced to identity) so each network read is copied exactly once
+                async for data in r.aiter_raw(chunk_size=STREAM_READ_SIZE):
+                    chunk_len = len(data)
+
+                    # Feed the in-flight data to the hash before it is written
+                    if hasher is not None:
+                        hasher.update(range_start + received, data)
+
+                    # Collect the chunk; a full batch is flushed in a single vectored write
+                    pending.append(data)
+                    received += chunk_len
+
+                    if len(pending) >= WRITE_COALESCE_BUFFERS:
+                        _positioned_writev(fd, pending, pending_start)
+                        pending_start = range_start + received
+                        pending = []
+
+                    # Update the progress tracker
+                    progress.update(task, advance=chunk_len)
+
+                # Flush the final partial batch
+                if pending:
+                    _positioned_writev(fd, pending, pending_start)
+
+            break
+        except (ReadTimeout, RemoteProtocolError, TimeoutException):
+            # Keep the contiguous bytes that did arrive, then resume from the tail; attempts
+            # that made no progress escalate to the outer retry and its backoff
+            if pending:
+                _positioned_writev(fd, pending, pending_start)
+
+            if end <= 0 or received == received_at_last_failure:
+                raise
+
+            received_at_last_failure = received
+
+    # Record the fully written range so an interrupted download can skip it on resume
+    if resume_tracker is not None and end > 0:
+        resume_tracker.mark_range_complete(range_start, end)
+
+
+async def _download_ranges(
+    http_client: Client,
+    url: str,
+    fd: int,
+    chunk_ranges: Sequence[tuple[int, int]],
+    task_id: int,
+    progress: Progress | CoalescedProgress,
+    max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
+) -> None:
+    """
+    Download all byte ranges concurrently on a single event loop.
+
+    Args:
+        http_client: The synchronous HTTP client whose headers and settings are mirrored.
+        url: The URL of the file to download.
+        fd: The file descriptor of the output file.
+        chunk_ranges: A sequence of (start, end) byte ranges for each chunk.
+        task_id: The task ID for progress tracking.
+        progress: The progress tracker.
+        max_connections_per_host: Cap on simultaneous in-flight range requests against the host.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records each range as it completes.
+    """
+
+    # Cap in-flight requests so high fan-out does not trip server rate limits
+    connection_limit = min(MAX_CONNECTIONS, max_connections_per_host)
+    semaphore = Semaphore(connection_limit)
+
+    async def download_range_limited(start: int, end: int) -> None:
+        async with semaphore:
+            await _download_range(client, url, fd, start, end, task_id, progress, hasher, resume_tracker)
+
+    # Multiplex over HTTP/2 when the server negotiated it on the probe request, saving one
+    # TCP+TLS handshake and slow-start ramp per range; small transfers are dominated by that
+    # setup cost, so they prefer a single multiplexed connection even without a probe result
+    total_size = chunk_ranges[-1][1] + 1 if chunk_ranges else 0
+    server_multiplexes = getattr(http_client, "http_version", "") == "HTTP/2"
+    use_http2 = HTTP2_AVAILABLE and (server_multiplexes or total_size <= SMALL_FILE_PIPELINE_THRESHOLD)
+
+    async with AsyncClient(
+        follow_redirects=True,
+        headers=http_client.headers,
+        timeout=http_client.timeout,
+        transport=AsyncHTTPTransport(
+            http2=use_http2,
+            verify=SHARED_SSL_CONTEXT if getattr(http_client, "verify_tls", True) else UNVERIFIED_SSL_CONTEXT,
+            limits=Limits(max_connections=connection_limit, max_keepalive_connections=connection_limit, keepalive_expiry=60),
+            socket_options=getattr(http_client, "socket_options", None),
+        ),
+    ) as client:
+        # Gather all range coroutines; the event loop multiplexes the socket waits
+        await gather(*[download_range_limited(start, end) for start, end in chunk_ranges])
+
+
+def download_ranges(
+    http_client: Client,
+    url: str,
+    output_path: str | PathLike,
+    chunk_ranges: Sequence[tuple[int, int]],
+    task_id: int,
+    progress: Progress | CoalescedProgress,
+    max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
+) -> None:
+    """
+    Download a file in ranges using an asyncio event loop instead of one thread per connection.
+
+    Args:
+        http_client: The synchronous HTTP client whose configuration is mirrored by the async client.
+        url: The URL of the file to download.
+        output_path: The path to save the downloaded file.
+        chunk_ranges: A sequence of (start, end) byte ranges for each chunk.
+        task_id: The task ID for progress tracking.
+        progress: The progress tracker.
+        max_connections_per_host: Cap on simultaneous in-flight range requests against the host.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records each range as it completes.
+    """
+
+    # A single range gains nothing from the event loop: stream it on the pooled sync client,
+    # whose probe connection is already open, instead of handshaking a fresh async client
+    if len(chunk_ranges) <= 1:
+        download_without_buffer(http_client, url, output_path, chunk_ranges, task_id, progress, hasher, resume_tracker)
+
+        return
+
+    try:
+        get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # The caller already drives an event loop; asyncio.run would fail, so use the threaded path
+        download_without_buffer(http_client, url, output_path, chunk_ranges, task_id, progress, hasher, resume_tracker)
+
+        return
+
+    # Open the output file once; ranges write to disjoint offsets through the shared descriptor
+    fd = os_open(Path(output_path).as_posix(), O_WRONLY | O_CREAT)
+
+    try:
+        coroutine = _download_ranges(
+            http_client, url, fd, chunk_ranges, task_id, progress, max_connections_per_host, hasher, resume_tracker
+        )
+
+        if uv_new_event_loop is not None:
+            # Drive the download on a libuv loop when uvloop is installed; asyncio.run has no
+            # loop-factory parameter before Python 3.12, so the loop is managed by hand
+            loop = uv_new_event_loop()
+
+            try:
+                loop.run_until_complete(coroutine)
+            finally:
+                loop.close()
+        else:
+            run(coroutine)
+    finally:
+        # Close the shared file descriptor
+        os_close(fd)
@@ -2,59 +2,133 @@
 from collections.abc import Sequence
 from concurrent.futures import ThreadPoolExecutor
 from mmap import ACCESS_WRITE, mmap
-from os import PathLike, ftruncate
+from os import O_CREAT, O_RDWR, O_WRONLY, PathLike, ftruncate, lseek
+from os import close as os_close
+from os import open as os_open
+from os import write as os_write
 from pathlib import Path
 from threading import Lock
 
 # Third-party modules
-from httpx import Client
+from httpx import Client, ReadTimeout, RemoteProtocolError, TimeoutException
 from rich.progress import Progress, TaskID
 
 # Local modules
-from .buffers import ChunkBuffer
-from .utils import download_retry_decorator
+from .buffers import BufferPool, ChunkBuffer
+from .constants import STREAM_READ_SIZE, WRITE_COALESCE_BUFFERS
+from .resume import ResumeTracker
+from .utils import CoalescedProgress, StreamingHasher, download_retry_decorator
 
 
-def download_with_buffer_writer(output_path: str | PathLike, size_bytes: int, position: int, data: bytes) -> None:
+try:
+    # Not available on Windows
+    from os import pwrite
+except ImportError:
+    pwrite = None
+
+try:
+    # Vectored positioned write, not available on Windows. io_uring was considered for this path
+    # but needs a compiled binding and Linux >= 5.6; batching chunks through pwritev gets most of
+    # the syscall reduction with no extra dependency, and page-cache writes rarely block anyway.
+    from os import pwritev
+except ImportError:
+    pwritev = None
+
+# Serializes the seek+write fallback used where pwrite is unavailable
+_seek_write_lock = Lock()
+
+
+def _positioned_write(fd: int, data: bytes, offset: int) -> int:
     """
-    Write the downloaded chunk to the file.
+    Write data to a file descriptor at the given offset without moving a shared cursor.
+
+    Uses pwrite where available so concurrent workers can write disjoint ranges lock-free; falls back to a locked seek+write elsewhere.
 
     Args:
-        output_path: The path to the file.
-        size_bytes: The size of the file in bytes.
-        position: The position to start writing the data in the file.
-        data: The data to be written.
+        fd: The file descriptor to write to.
+        data: The data to write.
+        offset: The absolute byte offset to write at.
+
+    Returns:
+        The number of bytes written.
     """
 
-    with Path(output_path).open("r+b") as f:
-        # Get the current size of the file
-        current_size = f.seek(0, 2)
+    if pwrite is not None:
+        return pwrite(fd, data, offset)
 
-        # If the file is not large enough, truncate it to the correct size
-        if current_size < size_bytes:
-            ftruncate(f.fileno(), size_bytes)
+    # Fallback: serialize the seek+write pair on a shared lock
+    with _seek_write_lock:
+        lseek(fd, offset, 0)
+
+        return os_write(fd, data)
+
+
+def _positioned_writev(fd: int, buffers: list[bytes], offset: int) -> None:
+    """
+    Write a batch of contiguous buffers to a file descriptor starting at the given offset.
+
+    Uses pwritev where available so a whole batch costs a single syscall; falls back to one positioned write per buffer elsewhere.
+
+    Args:
+        fd: The file descriptor to write to.
+        buffers: The buffers to write, contiguous in file order.
+        offset: The absolute byte offset of the first buffer.
+    """
 
-        # Write the data to the file
-        with mmap(f.fileno(), length=size_bytes, access=ACCESS_WRITE) as mm:
-            mm[position : position + len(data)] = data
+    if pwritev is None or len(buffers) == 1:
+        for data in buffers:
+            offset += _positioned_write(fd, data, offset)
 
-            # Flush the data to disk
-            mm.flush()
+        return
+
+    written = pwritev(fd, buffers, offset)
+    total = sum(len(data) for data in buffers)
+
+    # Regular files rarely short-write, but finish the tail if the kernel returns early;
+    # skip the buffers that already landed instead of re-joining the whole batch
+    if written < total:
+        offset += written
+
+        for data in buffers:
+            if written >= len(data):
+                written -= len(data)
+                continue
+
+            offset += _positioned_write(fd, memoryview(data)[written:] if written else data, offset)
+            written = 0
+
+
+def download_with_buffer_writer(output_mmap: mmap, position: int, data: bytes | memoryview) -> None:
+    """
+    Write the downloaded chunk into the shared mapping of the output file.
+
+    The pages are left dirty so the kernel flushes them in the background, overlapping disk writeback with the remaining network transfer instead of stalling the worker on a synchronous msync per completed chunk. An in-kernel flush (memfd-backed slabs + copy_file_range) would not help here: the chunk bytes originate in userspace from the HTTP stream, so they cross into the page cache exactly once either way, and this store does it without adding a syscall per flush.
+
+    Args:
+        output_mmap: The writable mapping of the output file, shared by all workers.
+        position: The position to start writing the data in the file.
+        data: The data to be written.
+    """
+
+    # Disjoint slice assignments from concurrent workers are safe: each worker owns its range
+    output_mmap[position : position + len(data)] = data
 
 
 @download_retry_decorator
 def download_with_buffer_worker(
     http_client: Client,
     url: str,
-    output_path: str | PathLike,
-    size_bytes: int,
-    chunk_buffers: dict[str, ChunkBuffer],
+    output_mmap: mmap,
+    chunk_buffers: list[ChunkBuffer | None],
+    buffer_pool: BufferPool,
     write_positions: list[int],
     start: int,
     end: int,
     chunk_id: int,
     task_id: int,
-    progress: Progress,
+    progress: Progress | CoalescedProgress,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
 ) -> None:
     """
     Worker function for downloading a file chunk using a buffer.
@@ -62,49 +136,91 @@ def download_with_buffer_worker(
     Args:
         http_client: The HTTP client to use for the request.
         url: The URL of the file to download.
-        output_path: The path to save the downloaded file.
-        size_bytes: The total size of the file in bytes.
-        chunk_buffers: A dictionary of chunk buffers.
+        output_mmap: The writable mapping of the output file, shared by all workers.
+        chunk_buffers: The per-chunk buffers, indexed by chunk ID.
+        buffer_pool: The pool of reusable slabs backing the chunk buffers.
         write_positions: List of write positions for each chunk.
         start: The start byte of the chunk.
         end: The end byte of the chunk.
         chunk_id: The ID of the chunk being processed.
         task_id: The task ID for progress tracking.
         progress: The progress tracker.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records the range once it is fully written.
     """
 
-    try:
-        # Initialize a new buffer for the chunk
-        chunk_buffers[chunk_id] = ChunkBuffer()
-
-        if end > 0:
-            # Set the range header for the HTTP request
-            http_client.headers["Range"] = f"bytes={start}-{end}"
+    # Bytes received so far within this range; a mid-stream failure re-requests only the
+    # missing tail, and staged-but-unflushed buffer contents survive across those attempts
+    received = 0
+    received_at_last_failure = -1
 
-        # Stream the response from the server
-        with http_client.stream("GET", url) as r:
-            r.raise_for_status()  # Raise an error for bad responses
+    # Built once instead of per read; the loop body only does integer math on it
+    task = TaskID(task_id)
 
-            # Iterate over the response data in 1MB chunks
-            for data in r.iter_bytes(chunk_size=1024 * 1024):
-                if not data:
-                    break
+    # A full restart (outer retry) refetches the range from its start, so the flush cursor
+    # must rewind with it or resumed flushes would land at stale offsets
+    write_positions[chunk_id] = 0
 
-                # Write data to the buffer and file if a complete chunk is available
-                if complete_chunk := chunk_buffers[chunk_id].write(data, size_bytes):
-                    download_with_buffer_writer(output_path, size_bytes, start + write_positions[chunk_id], complete_chunk)
-                    write_positions[chunk_id] += len(complete_chunk)
+    try:
+        # Initialize a new buffer for the chunk, backed by a pooled slab; the local binding
+        # keeps the hot loop free of per-read container lookups
+        chunk_buffer = chunk_buffers[chunk_id] = ChunkBuffer(pool=buffer_pool)
 
-                # Update the progress bar
-                progress.update(TaskID(task_id), advance=len(data))
+        while True:
+            # Per-request Range header; mutating the shared client's headers instead would race
+            # with the other workers, and httpx merges these with the client defaults anyway
+            headers = {"Range": f"bytes={start + received}-{end}"} if end > 0 else None
 
-            # Write any remaining data in the buffer to the file
-            if remaining := chunk_buffers[chunk_id].current_buffer.getvalue():
-                download_with_buffer_writer(output_path, size_bytes, start + write_positions[chunk_id], remaining)
+            try:
+                # Stream the response from the server
+                with http_client.stream("GET", url, headers=headers) as r:
+                    r.raise_for_status()  # Raise an error for bad responses
+
+                    # Iterate over the raw response data in STREAM_READ_SIZE chunks, skipping the content-decoding layer
+                    # (Accept-Encoding is forced to identity) so each network read is copied exactly once
+                    for data in r.iter_raw(chunk_size=STREAM_READ_SIZE):
+                        if not data:
+                            break
+
+                        # Feed the in-flight data to the hash before it is staged
+                        if hasher is not None:
+                            hasher.update(start + received, data)
+
+                        data_len = len(data)
+                        received += data_len
+
+                        # Write data to the buffer and file if a complete chunk is available
+                        if (complete_chunk := chunk_buffer.write(memoryview(data))) is not None:
+                            download_with_buffer_writer(output_mmap, start + write_positions[chunk_id], complete_chunk)
+                            write_positions[chunk_id] += len(complete_chunk)
+
+                            # Release the view so the slab can be resized by later writes
+                            complete_chunk.release()
+
+                        # Update the progress bar
+                        progress.update(task, advance=data_len)
+
+                break
+            except (ReadTimeout, RemoteProtocolError, TimeoutException):
+                # Resume from the tail of what arrived; attempts that made no progress
+                # escalate to the outer retry and its backoff
+                if end <= 0 or received == received_at_last_failure:
+                    raise
+
+                received_at_last_failure = received
+
+        # Write any remaining data in the buffer to the file
+        if remaining := chunk_buffer.get_remaining():
+            download_with_buffer_writer(output_mmap, start + write_positions[chunk_id], remaining)
+            remaining.release()
+
+        # Record the fully written range so an interrupted download can skip it on resume
+        if resume_tracker is not None and end > 0:
+            resume_tracker.mark_range_complete(start, end)
     finally:
-        # Clean up the buffer to free memory
-        if chunk_id in chunk_buffers and hasattr(chunk_buffers[chunk_id], "current_buffer"):
-            chunk_buffers[chunk_id].current_buffer.close()
+        # Release the buffer slab back to the pool
+        if chunk_buffers[chunk_id] is not None:
+            chunk_buffers[chunk_id].close()
 
 
 def download_with_buffer(
@@ -112,57 +228,89 @@ def download_with_buffer(
     url: str,
     output_path: str | PathLike,
     size_bytes: int,
-    chunk_buffers: dict[str, ChunkBuffer],
+    chunk_buffers: list[ChunkBuffer | None],
     chunk_ranges: Sequence[tuple[int, int]],
     task_id: int,
-    progress: Progress,
+    progress: Progress | CoalescedProgress,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
 ) -> None:
     """
     Download a file using multiple buffered chunk downloads.
 
+    The unbuffered paths already write each range straight to its file offset with positioned writes; this path exists for targets where staging in RAM first is worth it (spinning disks, network filesystems), trading one extra memory copy for large sequential flushes.
+
     Args:
         http_client: The HTTP client to use for the request.
         url: The URL of the file to download.
         output_path: The path to save the downloaded file.
         size_bytes: The total size of the file in bytes.
-        chunk_buffers: A dictionary of chunk buffers.
+        chunk_buffers: The per-chunk buffers, indexed by chunk ID; resized to match the ranges.
         chunk_ranges: A sequence of (start, end) byte ranges for each chunk.
         task_id: The task ID for progress tracking.
         progress: The progress tracker.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records each range as it completes.
     """
 
-    # Initialize write positions for each chunk
+    # Initialize write positions and one buffer slot per chunk; integer indexing into the
+    # shared list keeps workers from hashing a key on every chunk arrival
     write_positions = [0] * len(chunk_ranges)
+    chunk_buffers[:] = [None] * len(chunk_ranges)
 
-    # Use a thread pool to download each chunk in parallel
-    with ThreadPoolExecutor(max_workers=len(chunk_ranges)) as executor:
-        # Submit download tasks for each chunk range
-        futures = [
-            executor.submit(
-                download_with_buffer_worker,
-                http_client,
-                url,
-                output_path,
-                size_bytes,
-                chunk_buffers,
-                write_positions,
-                start,
-                end,
-                i,
-                task_id,
-                progress,
-            )
-            for i, (start, end) in enumerate(chunk_ranges)
-        ]
-
-        # Wait for all download tasks to complete
-        for future in futures:
-            future.result()
+    # One pool of reusable slabs shared by all workers
+    buffer_pool = BufferPool()
+
+    # Map the output file once for the whole download instead of re-opening and re-mapping it
+    # on every flush; the mapping needs a read+write descriptor and a file already at full size
+    fd = os_open(Path(output_path).as_posix(), O_RDWR | O_CREAT)
+    ftruncate(fd, size_bytes)
+    output_mmap = mmap(fd, size_bytes, access=ACCESS_WRITE)
+
+    try:
+        # Use a thread pool to download each chunk in parallel
+        with ThreadPoolExecutor(max_workers=len(chunk_ranges)) as executor:
+            # Submit download tasks for each chunk range
+            futures = [
+                executor.submit(
+                    download_with_buffer_worker,
+                    http_client,
+                    url,
+                    output_mmap,
+                    chunk_buffers,
+                    buffer_pool,
+                    write_positions,
+                    start,
+                    end,
+                    i,
+                    task_id,
+                    progress,
+                    hasher,
+                    resume_tracker,
+                )
+                for i, (start, end) in enumerate(chunk_ranges)
+            ]
+
+            # Wait for all download tasks to complete
+            for future in futures:
+                future.result()
+    finally:
+        # Drop the mapping before the descriptor; dirty pages are flushed by the kernel
+        output_mmap.close()
+        os_close(fd)
 
 
 @download_retry_decorator
 def download_without_buffer_worker(
-    http_client: Client, url: str, output_path: str | PathLike, start: int, end: int, task_id: int, progress: Progress
+    http_client: Client,
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    task_id: int,
+    progress: Progress | CoalescedProgress,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
 ) -> None:
     """
     Download a chunk of a file without using a buffer.
@@ -170,40 +318,77 @@ def download_without_buffer_worker(
     Args:
         http_client: The HTTP client to use for the request.
         url: The URL of the file to download.
-        output_path: The path to save the downloaded file.
+        fd: The file descriptor of the output file, shared by all workers.
         start: The start byte position of the chunk.
         end: The end byte position of the chunk.
         task_id: The task ID for progress tracking.
         progress: The progress tracker.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records the range once it is fully written.
     """
 
-    # Lock for writing to the file
-    write_lock = Lock()
+    # Track progress within the range so a mid-stream failure re-requests only the missing
+    # tail instead of refetching bytes that already landed on disk
+    range_start = start
+    received = 0
+    received_at_last_failure = -1
+
+    # Built once instead of per read; the loop body only does integer math on it
+    task = TaskID(task_id)
+
+    while True:
+        # Per-request Range header; mutating the shared client's headers instead would race
+        # with the other workers, and httpx merges these with the client defaults anyway
+        headers = {"Range": f"bytes={range_start + received}-{end}"} if end > 0 else None
+
+        # Chunks awaiting their batched write, contiguous from pending_start
+        pending: list[bytes] = []
+        pending_start = range_start + received
+
+        try:
+            # Stream the request and write the response to the file
+            with http_client.stream("GET", url, headers=headers) as r:
+                r.raise_for_status()
 
-    # Set the Range header if end > 0
-    if end > 0:
-        http_client.headers["Range"] = f"bytes={start}-{end}"
+                # Iterate over the raw chunks of the response and write them to the file
+                for data in r.iter_raw(chunk_size=STREAM_READ_SIZE):
+                    chunk_len = len(data)
 
-    # Stream the request and write the response to the file
-    with http_client.stream("GET", url) as r:
-        r.raise_for_status()
+                    # Feed the in-flight data to the hash before it is written
+                    if hasher is not None:
+                        hasher.update(range_start + received, data)
 
-        # Iterate over the chunks of the response and write them to the file
-        for data in r.iter_bytes(chunk_size=1024 * 1024):
-            chunk_len = len(data)
+                    # Collect the chunk; a full batch is flushed in a single vectored write
+                    pending.append(data)
+                    received += chunk_len
 
-            # Acquire the write lock and seek to the correct position in the file
-            with write_lock, Path(output_path).open("r+b") as fo:
-                fo.seek(start)
+                    if len(pending) >= WRITE_COALESCE_BUFFERS:
+                        _positioned_writev(fd, pending, pending_start)
+                        pending_start = range_start + received
+                        pending = []
 
-                # Write the chunk to the file
-                fo.write(data)
+                    # Update the progress tracker
+                    progress.update(task, advance=chunk_len)
 
-                # Advance the start position
-                start += chunk_len
+                # Flush the final partial batch
+                if pending:
+                    _positioned_writev(fd, pending, pending_start)
 
-            # Update the progress tracker
-            progress.update(TaskID(task_id), advance=chunk_len)
+            break
+        except (ReadTimeout, RemoteProtocolError, TimeoutException):
+            # Keep the contiguous bytes that did arrive, then resume from the tail; attempts
+            # that made no progress escalate to the outer retry and its backoff
+            if pending:
+                _positioned_writev(fd, pending, pending_start)
+
+            if end <= 0 or received == received_at_last_failure:
+                raise
+
+            received_at_last_failure = received
+
+    # Record the fully written range so an interrupted download can skip it on resume
+    if resume_tracker is not None and end > 0:
+        resume_tracker.mark_range_complete(range_start, end)
 
 
 def download_without_buffer(
@@ -212,7 +397,9 @@ def download_without_buffer(
     output_path: str | PathLike,
     chunk_ranges: Sequence[tuple[int, int]],
     task_id: int,
-    progress: Progress,
+    progress: Progress | CoalescedProgress,
+    hasher: StreamingHasher | None = None,
+    resume_tracker: ResumeTracker | None = None,
 ) -> None:
     """
     Download a file in chunks using multiple threads and without using a buffer.
@@ -224,20 +411,31 @@ def download_without_buffer(
         chunk_ranges: A sequence of (start, end) byte ranges for each chunk.
         task_id: The task ID for progress tracking.
         progress: The progress tracker.
+        hasher: An optional StreamingHasher fed with the data as it arrives.
+        resume_tracker: An optional ResumeTracker that records each range as it completes.
     """
 
-    # Use a thread pool to download each chunk in parallel
-    with ThreadPoolExecutor(max_workers=len(chunk_ranges)) as executor:
-        # Submit download tasks for each chunk range
-        futures = [
-            executor.submit(download_without_buffer_worker, http_client, url, output_path, start, end, task_id, progress)
-            for start, end in chunk_ranges
-        ]
+    # Open the output file once; workers write to disjoint offsets through the shared descriptor
+    fd = os_open(Path(output_path).as_posix(), O_WRONLY | O_CREAT)
 
-        # Wait for all download tasks to complete
-        for future in futures:
-            try:
-                # Raise any exceptions that occurred during the download
-                future.result()
-            except Exception as e:
-                raise e
+    try:
+        # Use a thread pool to download each chunk in parallel
+        with ThreadPoolExecutor(max_workers=len(chunk_ranges)) as executor:
+            # Submit download tasks for each chunk range
+            futures = [
+                executor.submit(
+                    download_without_buffer_worker, http_client, url, fd, start, end, task_id, progress, hasher, resume_tracker
+                )
+                for start, end in chunk_ranges
+            ]
+
+            # Wait for all download tasks to complete
+            for future in futures:
+                try:
+                    # Raise any exceptions that occurred during the download
+                    future.result()
+                except Exception as e:
+                    raise e
+    finally:
+        # Close the shared file descriptor
+        os_close(fd)
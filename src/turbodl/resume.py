@@ -0,0 +1,149 @@
+# Standard modules
+from json import JSONDecodeError, dumps, loads
+from os import PathLike, fsync, replace
+from pathlib import Path
+from threading import Lock
+
+# Local modules
+from .constants import ONE_MB
+
+
+# Sidecar files live next to the output file under this suffix
+SIDECAR_SUFFIX = ".turbodl"
+
+# Completed progress is flushed to disk at most once per this many new bytes
+FSYNC_INTERVAL_BYTES = 16 * ONE_MB
+
+
+class ResumeTracker:
+    """
+    Tracks completed byte ranges of a download in a sidecar file so an interrupted download can be resumed.
+
+    The sidecar holds the source URL, the total file size and the list of completed (start, end) ranges. On a
+    re-invocation against the same URL and size, ranges already covered by the recorded progress are skipped.
+    """
+
+    def __init__(self, output_path: str | PathLike, url: str, total_size: int) -> None:
+        """
+        Initialize a tracker for the given output file.
+
+        Args:
+            output_path: The path of the output file the sidecar belongs to.
+            url: The URL of the file being downloaded.
+            total_size: The total size of the file in bytes.
+        """
+
+        # Initialize private attributes
+        self._sidecar_path: Path = Path(f"{Path(output_path).as_posix()}{SIDECAR_SUFFIX}")
+        self._url: str = url
+        self._total_size: int = total_size
+        self._completed: list[tuple[int, int]] = []
+        self._lock: Lock = Lock()
+        self._unsynced_bytes: int = 0
+
+    @property
+    def has_progress(self) -> bool:
+        """Whether any range has been recorded as complete."""
+
+        return bool(self._completed)
+
+    def load(self) -> bool:
+        """
+        Load previously recorded progress from the sidecar file.
+
+        A sidecar recorded for a different URL or file size is stale and is discarded.
+
+        Returns:
+            True if matching progress was loaded, False otherwise.
+        """
+
+        try:
+            payload = loads(self._sidecar_path.read_text())
+        except (OSError, JSONDecodeError, UnicodeDecodeError):
+            return False
+
+        # Discard progress recorded for a different file
+        if payload.get("url") != self._url or payload.get("size") != self._total_size:
+            self.discard()
+
+            return False
+
+        self._completed = [(int(start), int(end)) for start, end in payload.get("ranges", [])]
+
+        return self.has_progress
+
+    def _merged_ranges(self) -> list[tuple[int, int]]:
+        """Return the completed ranges merged into a sorted, non-overlapping list."""
+
+        merged: list[tuple[int, int]] = []
+
+        for start, end in sorted(self._completed):
+            # Extend the previous range when this one touches or overlaps it
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        return merged
+
+    def filter_pending(self, chunk_ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Return the subset of chunk ranges not fully covered by the recorded progress.
+
+        Args:
+            chunk_ranges: A sequence of (start, end) byte ranges for each chunk.
+
+        Returns:
+            The ranges that still need to be downloaded.
+        """
+
+        merged = self._merged_ranges()
+
+        return [
+            (start, end)
+            for start, end in chunk_ranges
+            if not any(done_start <= start and end <= done_end for done_start, done_end in merged)
+        ]
+
+    def mark_range_complete(self, start: int, end: int) -> None:
+        """
+        Record a fully downloaded range and persist the sidecar every FSYNC_INTERVAL_BYTES of new progress.
+
+        Args:
+            start: The start byte position of the completed range.
+            end: The end byte position of the completed range.
+        """
+
+        with self._lock:
+            self._completed.append((start, end))
+            self._unsynced_bytes += end - start + 1
+
+            # Throttle disk flushes so bookkeeping stays off the hot path
+            if self._unsynced_bytes >= FSYNC_INTERVAL_BYTES:
+                self._save_locked()
+
+    def save(self) -> None:
+        """Persist the recorded progress to the sidecar file."""
+
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        """Write the sidecar atomically via a temporary file. Must be called with the lock held."""
+
+        payload = dumps({"url": self._url, "size": self._total_size, "ranges": self._merged_ranges()})
+        temporary_path = self._sidecar_path.with_suffix(f"{SIDECAR_SUFFIX}.tmp")
+
+        with temporary_path.open("w") as f:
+            f.write(payload)
+            f.flush()
+            fsync(f.fileno())
+
+        # Atomic rename so a crash never leaves a truncated sidecar behind
+        replace(temporary_path, self._sidecar_path)
+        self._unsynced_bytes = 0
+
+    def discard(self) -> None:
+        """Remove the sidecar file, e.g. after a successful download."""
+
+        self._sidecar_path.unlink(missing_ok=True)
@@ -1,26 +1,82 @@
 # Standard modules
 from collections.abc import Generator
-from os import getenv
+from os import getenv, getpid
 from pathlib import Path
+from shutil import rmtree
 from tempfile import TemporaryDirectory
+from uuid import uuid4
 
 # Third-party modules
 from pytest import fixture
 
 # Local modules
 from src.turbodl import TurboDL
+from src.turbodl.utils import is_ram_directory
 
 
-@fixture
+@fixture(scope="session")
 def downloader() -> TurboDL:
-    """Return a configured TurboDL instance."""
+    """Return a configured TurboDL instance, shared across the session so its connection pool is reused."""
+
+    return TurboDL(connection_speed_mbps=1000 if getenv("GITHUB_ACTIONS") in ("true", "1") else 100, show_progress_bar=False)
+
+
+@fixture(scope="session")
+def session_temporary_path() -> Generator:
+    """Create a session-wide scratch directory, on tmpfs where available so large-file teardown is instant."""
+
+    shm = Path("/dev/shm")
+
+    if shm.is_dir():
+        base_path = shm / f"turbodl-tests-{getpid()}"
+        base_path.mkdir()
+
+        yield base_path
+
+        rmtree(base_path, ignore_errors=True)
+    else:
+        with TemporaryDirectory() as tmpdirname:
+            yield Path(tmpdirname)
+
+
+@fixture(scope="session")
+def session_disk_path() -> Generator:
+    """Create a session-wide disk-backed scratch directory for the RAM-buffer tests, since turbodl force-disables the RAM buffer on tmpfs destinations."""
+
+    with TemporaryDirectory(prefix="turbodl-tests-") as tmpdirname:
+        path = Path(tmpdirname)
 
-    return TurboDL(connection_speed_mbps=1000 if getenv("GITHUB_ACTIONS") in ("true", "1") else 100)
+        if not is_ram_directory(path):
+            yield path
+        else:
+            # The system temp dir itself lives in RAM; fall back to the working tree
+            disk_path = Path.cwd() / f"turbodl-tests-{getpid()}"
+            disk_path.mkdir()
+
+            yield disk_path
+
+            rmtree(disk_path, ignore_errors=True)
+
+
+@fixture
+def temporary_path(session_temporary_path: Path) -> Generator:
+    """Create a per-test subdirectory of the session scratch directory."""
+
+    test_path = session_temporary_path / uuid4().hex
+    test_path.mkdir()
+
+    yield test_path
+
+    rmtree(test_path, ignore_errors=True)
 
 
 @fixture
-def temporary_path() -> Generator:
-    """Create a temporary directory for tests."""
+def disk_temporary_path(session_disk_path: Path) -> Generator:
+    """Create a per-test subdirectory of the disk-backed scratch directory."""
+
+    test_path = session_disk_path / uuid4().hex
+    test_path.mkdir()
+
+    yield test_path
 
-    with TemporaryDirectory() as tmpdirname:
-        yield Path(tmpdirname)
+    rmtree(test_path, ignore_errors=True)
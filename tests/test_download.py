@@ -43,35 +43,21 @@ def test_invalid_url(downloader: TurboDL, temporary_path: Path) -> None:
         downloader.download(url=url, output_path=temporary_path)
 
 
-@mark.parametrize("file_info", TEST_FILES, ids=lambda x: f"{x['name']}_with_ram")
-def test_download_file_with_ram(downloader: TurboDL, temporary_path: Path, file_info: dict) -> None:
-    """Test file download with RAM buffer enabled."""
+@mark.parametrize("use_ram_buffer", [True, False], ids=["with_ram", "without_ram"])
+@mark.parametrize("file_info", TEST_FILES, ids=lambda x: x["name"])
+def test_download_file(
+    downloader: TurboDL, temporary_path: Path, disk_temporary_path: Path, file_info: dict, use_ram_buffer: bool
+) -> None:
+    """Test file download with the RAM buffer enabled and disabled."""
 
-    downloader.download(
-        url=file_info["url"],
-        output_path=temporary_path,
-        enable_ram_buffer=True,
-        expected_hash=file_info["expectedHash"],
-        hash_type=file_info["hashType"],
-    )
-    output_path = Path(downloader.output_path)
-
-    assert output_path.name == file_info["expectedFilename"], (
-        f"URL: {file_info['url']} - "
-        f"Output file name: {output_path.name} - "
-        f"Expected filename: {file_info['expectedFilename']} - "
-        f"Error: Downloaded file name is different than expected"
-    )
-
-
-@mark.parametrize("file_info", TEST_FILES, ids=lambda x: f"{x['name']}_without_ram")
-def test_download_file_without_ram(downloader: TurboDL, temporary_path: Path, file_info: dict) -> None:
-    """Test file download with RAM buffer disabled."""
+    # The RAM-buffered variant must target a disk-backed directory: on a tmpfs destination
+    # turbodl silently disables the buffer and both variants would exercise the same path
+    output_path = disk_temporary_path if use_ram_buffer else temporary_path
 
     downloader.download(
         url=file_info["url"],
-        output_path=temporary_path,
-        enable_ram_buffer=False,
+        output_path=output_path,
+        enable_ram_buffer=use_ram_buffer,
         expected_hash=file_info["expectedHash"],
         hash_type=file_info["hashType"],
     )